@@ -1,27 +1,244 @@
 # app.py (Plotly version with Plotly tabs)
+import os
+from functools import partial
+from pathlib import Path
+from typing import NamedTuple
+
 import streamlit as st
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pacsv
 import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+
+# st.plotly_chart serializes through plotly.io.to_json; orjson is several times faster.
+pio.json.config.default_engine = "orjson"
+pio.templates.default = "plotly_dark"
 
 st.set_page_config(page_title="Survey Dashboard", layout="wide")
 
 QUESTION_COLS = ["Question #1", "Question #2", "Question #3", "Question #4"]
+GENDER_COLOR = {"M": "#3B82F6", "F": "#EC4899"}
+# Every cache keyed on the Gender/Age selection; the selection space is tiny.
+FILTER_CACHE_ENTRIES = 32
+# Above this many participants, boxplots draw only outliers instead of every point.
+BOX_POINTS_MAX_ROWS = 200
+# Rows sent to the browser by default; larger tables are sliced before rendering.
+N_PREVIEW = 500
+N_RANKING_PREVIEW = 50
+
+CATEGORY_COLS = ["Gender", "Age"]
+CSV_COLUMN_TYPES = {
+    **{c: pa.dictionary(pa.int32(), pa.string()) for c in CATEGORY_COLS},
+    **{q: pa.int8() for q in QUESTION_COLS},
+}
+
+@st.cache_data(persist="disk")
+def read_survey(path: str, mtime: float) -> pd.DataFrame:
+    # mtime is only part of the cache key: editing the CSV invalidates the persisted copy.
+    parquet_path = Path(path).with_suffix(".parquet")
+    if parquet_path.exists() and parquet_path.stat().st_mtime >= mtime:
+        df = pd.read_parquet(parquet_path)
+    else:
+        table = pacsv.read_csv(
+            path,
+            convert_options=pacsv.ConvertOptions(column_types=CSV_COLUMN_TYPES, strings_can_be_null=True),
+        )
+        df = table.to_pandas()
+        # Arrow dictionaries keep first-seen order; sort them like pandas would.
+        for c in CATEGORY_COLS:
+            df[c] = df[c].cat.reorder_categories(sorted(df[c].cat.categories))
+        try:
+            df.to_parquet(parquet_path, index=False)
+        except OSError:
+            pass  # read-only checkout; parse the CSV again on the next cold start
+    # Blank score cells load as NaN; average over the answered questions only.
+    df["Avg Score"] = np.nanmean(df[QUESTION_COLS].to_numpy(dtype=np.float32), axis=1)
+    return df
 
-@st.cache_data
+@st.cache_resource
 def load_data(path: str = "test_data.csv") -> pd.DataFrame:
-    df = pd.read_csv(path)
-    df["Avg Score"] = df[QUESTION_COLS].mean(axis=1)
-    return df
+    # One frame shared by every session and rerun (no per-call copy); treat it as read-only.
+    return read_survey(path, os.path.getmtime(path))
 
 def to_long(df: pd.DataFrame) -> pd.DataFrame:
-    return df.melt(
-        id_vars=["Participant", "Gender", "Age", "Avg Score"],
-        value_vars=QUESTION_COLS,
-        var_name="Question",
-        value_name="Score"
+    # Same layout as df.melt(...): one block of rows per question, in QUESTION_COLS order.
+    k = len(QUESTION_COLS)
+    long_df = (
+        df[["Participant", "Gender", "Age", "Avg Score"]]
+        .iloc[np.tile(np.arange(len(df)), k)]
+        .reset_index(drop=True)
+    )
+    long_df["Question"] = pd.Categorical.from_codes(
+        np.repeat(np.arange(k, dtype=np.int8), len(df)), categories=QUESTION_COLS
+    )
+    long_df["Score"] = df[QUESTION_COLS].to_numpy().ravel(order="F")
+    return long_df
+
+@st.cache_resource
+def load_long_data() -> pd.DataFrame:
+    # Reshaped once; filtered views slice it rather than re-melting.
+    return to_long(load_data())
+
+def category_mask(col: pd.Series, selected: tuple) -> np.ndarray:
+    # Lookup table indexed by category code; the trailing False catches code -1 (NaN).
+    lut = np.append(np.isin(col.cat.categories.to_numpy(), selected), False)
+    return lut[col.cat.codes.to_numpy()]
+
+def category_counts(col: pd.Series) -> pd.DataFrame:
+    # Observed categories only, in category order.
+    codes = col.cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(col.cat.categories))
+    observed = counts > 0
+    return pd.DataFrame({col.name: col.cat.categories[observed], "Count": counts[observed]})
+
+def group_means(col: pd.Series, frame: pd.DataFrame) -> pd.DataFrame:
+    # Column means of frame per observed category of col, in category order.
+    codes = col.cat.codes.to_numpy()
+    valid = codes >= 0
+    values = frame.to_numpy(dtype=np.float64)[valid]
+    answered = ~np.isnan(values)
+    sums = np.zeros((len(col.cat.categories), values.shape[1]))
+    np.add.at(sums, codes[valid], np.nan_to_num(values))
+    # Per-column counts skip blank scores, like pandas' skipna mean.
+    counts = np.zeros(sums.shape, dtype=np.int64)
+    np.add.at(counts, codes[valid], answered)
+    observed = np.bincount(codes[valid], minlength=len(sums)) > 0
+    with np.errstate(invalid="ignore"):
+        means = sums[observed] / counts[observed]
+    return pd.DataFrame(
+        means,
+        index=col.cat.categories[observed].rename(col.name),
+        columns=frame.columns,
+    )
+
+def box_points(n_rows: int) -> str:
+    return "all" if n_rows <= BOX_POINTS_MAX_ROWS else "outliers"
+
+def filter_mask(genders: tuple, ages: tuple) -> np.ndarray:
+    df = load_data()
+    return category_mask(df["Gender"], genders) & category_mask(df["Age"], ages)
+
+class SurveyView(NamedTuple):
+    filtered: pd.DataFrame
+    age_order: list
+    gender_counts: pd.DataFrame
+    age_counts: pd.DataFrame
+    mean_avg: float
+    best_row: pd.Series | None
+    worst_row: pd.Series | None
+
+@st.cache_data(max_entries=FILTER_CACHE_ENTRIES, show_spinner=False)
+def compute_view(genders: tuple, ages: tuple) -> SurveyView:
+    filtered = load_data().iloc[filter_mask(genders, ages)]
+    age_order = sorted(filtered["Age"].dropna().unique())
+
+    avg = filtered["Avg Score"].to_numpy()
+    return SurveyView(
+        filtered=filtered,
+        age_order=age_order,
+        gender_counts=category_counts(filtered["Gender"]),
+        age_counts=category_counts(filtered["Age"]),
+        mean_avg=float(np.nanmean(avg, dtype=np.float64)) if avg.size else float("nan"),
+        best_row=filtered.iloc[np.nanargmax(avg)] if avg.size else None,
+        worst_row=filtered.iloc[np.nanargmin(avg)] if avg.size else None,
     )
 
-df = load_data()
+@st.cache_data(max_entries=FILTER_CACHE_ENTRIES, show_spinner=False)
+def question_stats(genders: tuple, ages: tuple) -> pd.DataFrame:
+    return compute_view(genders, ages).filtered[QUESTION_COLS].agg(["mean", "median", "std"])
+
+@st.cache_data(max_entries=FILTER_CACHE_ENTRIES, show_spinner=False)
+def overall_means(genders: tuple, ages: tuple) -> np.ndarray:
+    return compute_view(genders, ages).filtered[QUESTION_COLS].mean().to_numpy()
+
+@st.cache_data(max_entries=FILTER_CACHE_ENTRIES, show_spinner=False)
+def age_question_means(genders: tuple, ages: tuple) -> pd.DataFrame:
+    filtered = compute_view(genders, ages).filtered
+    return group_means(filtered["Age"], filtered[QUESTION_COLS])
+
+# Shared via cache_resource so reruns skip unpickling it; callers only read from it.
+@st.cache_resource(max_entries=FILTER_CACHE_ENTRIES, show_spinner=False)
+def participant_index(genders: tuple, ages: tuple) -> dict[str, int]:
+    # Participant -> position in the filtered frame; the first row wins on duplicates.
+    names = compute_view(genders, ages).filtered["Participant"].to_numpy()
+    return {name: i for i, name in reversed(list(enumerate(names)))}
+
+@st.cache_data(max_entries=FILTER_CACHE_ENTRIES, show_spinner=False)
+def box_figure(split_by: str, genders: tuple, ages: tuple) -> go.Figure:
+    mask = filter_mask(genders, ages)
+    # to_long() is question-major, so the long-form mask is the row mask once per question.
+    # Sliced here rather than kept on SurveyView, so compute_view hits don't unpickle it.
+    long_df = load_long_data().iloc[np.tile(mask, len(QUESTION_COLS))]
+    age_order = compute_view(genders, ages).age_order
+    hue_col = None if split_by == "None" else split_by
+
+    # One spec for every split; only the color encoding and legend change.
+    fig_box = px.box(
+        long_df,
+        x="Question",
+        y="Score",
+        color=hue_col,
+        points=box_points(int(mask.sum())),
+        category_orders={"Question": QUESTION_COLS, "Age": age_order},
+        color_discrete_map=GENDER_COLOR if hue_col == "Gender" else None,
+        title="Boxplots by Question" if hue_col is None else f"Boxplots by Question (split by {hue_col})",
+    )
+    fig_box.update_layout(margin=dict(l=20, r=20, t=60, b=20), xaxis_title="", yaxis_title="Score")
+    if hue_col is not None:
+        fig_box.update_layout(
+            legend=dict(title=hue_col, x=1.02, y=1.0, xanchor="left", yanchor="top"),
+            margin_r=180,
+        )
+
+    fig_box.update_yaxes(range=[0, 7], dtick=1)
+    return fig_box
+
+# Arrow tables are immutable, so they can be shared via cache_resource and passed
+# to st.dataframe without its pandas -> Arrow conversion on every rerun.
+@st.cache_resource(max_entries=FILTER_CACHE_ENTRIES, show_spinner=False)
+def get_ranking(genders: tuple, ages: tuple) -> pa.Table:
+    filtered = compute_view(genders, ages).filtered
+    order = np.argsort(-filtered["Avg Score"].to_numpy(), kind="stable")
+    ranking = pa.Table.from_pandas(
+        filtered[["Participant", "Avg Score", "Gender", "Age"]].iloc[order], preserve_index=False
+    )
+    return ranking.add_column(0, "Rank", pa.array(np.arange(1, len(order) + 1, dtype=np.int32)))
+
+@st.cache_resource(max_entries=FILTER_CACHE_ENTRIES, show_spinner=False)
+def data_table(filter_key: tuple | None) -> pa.Table:
+    # filter_key=None means the full, unfiltered dataset.
+    frame = load_data() if filter_key is None else compute_view(*filter_key).filtered
+    return pa.Table.from_pandas(frame, preserve_index=False)
+
+@st.cache_data(max_entries=FILTER_CACHE_ENTRIES, show_spinner=False)
+def to_csv_bytes(filter_key: tuple | None) -> bytes:
+    # filter_key=None means the full, unfiltered dataset.
+    frame = load_data() if filter_key is None else compute_view(*filter_key).filtered
+    return frame.to_csv(index=False).encode("utf-8")
+
+def top_k_positions(values: np.ndarray, k: int) -> np.ndarray:
+    # Positions of the k largest values, largest first; ties keep row order and
+    # NaN comes last, same as a stable full sort but with an O(N) partition instead.
+    k = min(k, values.size)
+    missing = np.isnan(values)
+    idx = np.flatnonzero(~missing)
+    if idx.size > k:
+        neg = -values[idx]
+        kth = np.partition(neg, k - 1)[k - 1]
+        idx = idx[neg <= kth]
+    idx = idx[np.argsort(-values[idx], kind="stable")]
+    return np.concatenate([idx, np.flatnonzero(missing)])[:k]
+
+@st.cache_data
+def sidebar_options() -> tuple[list, list]:
+    df = load_data()
+    # Categories are exactly the sorted, non-null values parsed from the CSV.
+    return df["Gender"].cat.categories.tolist(), df["Age"].cat.categories.tolist()
+
+genders, ages = sidebar_options()
 
 st.title("Survey Dashboard")
 
@@ -29,40 +246,26 @@ st.title("Survey Dashboard")
 # Sidebar filters (global)
 # -------------------------
 st.sidebar.header("Filters")
-gender_filter = st.sidebar.multiselect(
-    "Gender",
-    options=sorted(df["Gender"].dropna().unique()),
-    default=sorted(df["Gender"].dropna().unique()),
-)
-age_filter = st.sidebar.multiselect(
-    "Age",
-    options=sorted(df["Age"].dropna().unique()),
-    default=sorted(df["Age"].dropna().unique()),
-)
+gender_filter = st.sidebar.multiselect("Gender", options=genders, default=genders)
+age_filter = st.sidebar.multiselect("Age", options=ages, default=ages)
 
-filtered = df[df["Gender"].isin(gender_filter) & df["Age"].isin(age_filter)].copy()
+filter_key = (tuple(sorted(gender_filter)), tuple(sorted(age_filter)))
+view = compute_view(*filter_key)
+filtered = view.filtered
 if filtered.empty:
     st.warning("No data matches the current filters. Try expanding Gender/Age selections.")
     st.stop()
 
-long_df = to_long(filtered)
-
-# Orders + colors
-question_order = QUESTION_COLS
-age_order = sorted(filtered["Age"].dropna().unique())
-gender_color = {"M": "#3B82F6", "F": "#EC4899"}
-
 # -------------------------
 # Overview
 # -------------------------
 st.subheader("Overview")
 
-best_row = filtered.loc[filtered["Avg Score"].idxmax()]
-worst_row = filtered.loc[filtered["Avg Score"].idxmin()]
+best_row, worst_row = view.best_row, view.worst_row
 
 c1, c2, c3, c4 = st.columns(4)
 c1.metric("Participants (filtered)", len(filtered))
-c2.metric("Overall mean (Avg Score)", f"{filtered['Avg Score'].mean():.2f}")
+c2.metric("Overall mean (Avg Score)", f"{view.mean_avg:.2f}")
 c3.metric(
     "Highest Avg Score (participant)",
     f"{best_row['Avg Score']:.2f}",
@@ -81,36 +284,21 @@ st.divider()
 # -------------------------
 st.markdown("### Participant Distribution")
 
-gender_counts = filtered["Gender"].value_counts().reset_index()
-gender_counts.columns = ["Gender", "Count"]
-
-age_counts = (
-    filtered["Age"]
-    .value_counts()
-    .reindex(age_order)
-    .fillna(0)
-    .astype(int)
-    .reset_index()
-)
-age_counts.columns = ["Age", "Count"]
+gender_counts, age_counts = view.gender_counts, view.age_counts
 
 colL, colR = st.columns(2)
 
 with colL:
-    fig_gender = px.bar(
-        gender_counts,
-        x="Gender",
-        y="Count",
-        text="Count",
-        template="plotly_dark",
-        title="Gender",
-    )
-    fig_gender.update_traces(
-        marker_color=[gender_color.get(g, "#999999") for g in gender_counts["Gender"]],
+    fig_gender = go.Figure(go.Bar(
+        x=gender_counts["Gender"],
+        y=gender_counts["Count"],
+        text=gender_counts["Count"],
+        marker_color=[GENDER_COLOR.get(g, "#999999") for g in gender_counts["Gender"]],
         textposition="outside",
         cliponaxis=False,
-    )
+    ))
     fig_gender.update_layout(
+        title="Gender",
         margin=dict(l=20, r=20, t=50, b=20),
         xaxis_title="",
         yaxis_title="Count",
@@ -119,17 +307,15 @@ with colL:
     st.plotly_chart(fig_gender, use_container_width=True)
 
 with colR:
-    fig_age = px.bar(
-        age_counts,
-        x="Age",
-        y="Count",
-        text="Count",
-        template="plotly_dark",
-        title="Age Group",
-        category_orders={"Age": age_order},
-    )
-    fig_age.update_traces(textposition="outside", cliponaxis=False)
+    fig_age = go.Figure(go.Bar(
+        x=age_counts["Age"],
+        y=age_counts["Count"],
+        text=age_counts["Count"],
+        textposition="outside",
+        cliponaxis=False,
+    ))
     fig_age.update_layout(
+        title="Age Group",
         margin=dict(l=20, r=20, t=50, b=20),
         xaxis_title="",
         yaxis_title="Count",
@@ -143,56 +329,33 @@ st.divider()
 # -------------------------
 # Score Distribution (Boxplots) (Plotly)
 # -------------------------
-st.markdown("### Score Distribution")
+@st.fragment
+def score_distribution(filter_key: tuple) -> None:
+    st.markdown("### Score Distribution")
 
-split_by = st.selectbox("Split distribution by", ["None", "Gender", "Age"], index=0)
+    split_by = st.selectbox("Split distribution by", ["None", "Gender", "Age"], index=0, key="split_by")
 
-if split_by == "None":
-    fig_box = px.box(
-        long_df,
-        x="Question",
-        y="Score",
-        points="all",
-        template="plotly_dark",
-        category_orders={"Question": question_order},
-        title="Boxplots by Question",
-    )
-    fig_box.update_layout(margin=dict(l=20, r=20, t=60, b=20), xaxis_title="", yaxis_title="Score")
-else:
-    hue_col = "Gender" if split_by == "Gender" else "Age"
-    fig_box = px.box(
-        long_df,
-        x="Question",
-        y="Score",
-        color=hue_col,
-        points="all",
-        template="plotly_dark",
-        category_orders={"Question": question_order, "Age": age_order},
-        color_discrete_map=gender_color if hue_col == "Gender" else None,
-        title=f"Boxplots by Question (split by {hue_col})",
-    )
-    fig_box.update_layout(
-        legend=dict(title=hue_col, x=1.02, y=1.0, xanchor="left", yanchor="top"),
-        margin=dict(l=20, r=180, t=60, b=20),
-        xaxis_title="",
-        yaxis_title="Score",
-    )
+    fig_box = box_figure(split_by, *filter_key)
+    st.plotly_chart(fig_box, use_container_width=True)
 
-fig_box.update_yaxes(range=[0, 7], dtick=1)
-st.plotly_chart(fig_box, use_container_width=True)
+score_distribution(filter_key)
 
 st.divider()
 
 # -------------------------
 # Tabs (Plotly)
 # -------------------------
-tab1, tab2 = st.tabs(["Participant View", "Question View"])
+@st.fragment
+def participant_view(filter_key: tuple) -> None:
+    filtered = compute_view(*filter_key).filtered
 
-with tab1:
     st.subheader("Participant View")
 
-    participant = st.selectbox("Select a participant", options=sorted(filtered["Participant"].unique()))
-    p = filtered[filtered["Participant"] == participant].iloc[0]
+    index = participant_index(*filter_key)
+    participant = st.selectbox("Select a participant", options=sorted(index), key="participant")
+    p = filtered.iloc[index[participant]]
+    # The row is object dtype (mixed columns); a blank score stays NaN here.
+    p_scores = pd.to_numeric(p[QUESTION_COLS])
 
     left, right = st.columns([1, 2])
 
@@ -203,67 +366,61 @@ with tab1:
         st.write(f"**Age:** {p['Age']}")
         st.write(f"**Avg Score (Q1–Q4):** {p['Avg Score']:.2f}")
 
-        score_table = pd.DataFrame({"Question": QUESTION_COLS, "Score": [p[q] for q in QUESTION_COLS]})
+        score_table = p_scores.rename_axis("Question").reset_index(name="Score")
         st.dataframe(score_table, hide_index=True, use_container_width=True)
 
     with right:
         st.markdown("**Participant vs Overall Mean (by question)**")
 
-        comp = pd.DataFrame({
-            "Question": QUESTION_COLS,
-            "Participant": [p[q] for q in QUESTION_COLS],
-            "Overall Mean": [filtered[q].mean() for q in QUESTION_COLS],
-        })
-
-        comp_long = comp.melt("Question", var_name="Series", value_name="Score")
-
-        fig_comp = px.bar(
-            comp_long,
-            x="Question",
-            y="Score",
-            color="Series",
+        fig_comp = go.Figure([
+            go.Bar(x=QUESTION_COLS, y=p_scores.to_numpy(dtype=float), name="Participant"),
+            go.Bar(x=QUESTION_COLS, y=overall_means(*filter_key), name="Overall Mean"),
+        ])
+        fig_comp.update_layout(
             barmode="group",
-            template="plotly_dark",
-            category_orders={"Question": question_order},
-            title="",
+            legend_title_text="Series",
+            margin=dict(l=20, r=20, t=20, b=20),
+            xaxis_title="",
+            yaxis_title="Score",
         )
-        fig_comp.update_layout(margin=dict(l=20, r=20, t=20, b=20), xaxis_title="", yaxis_title="Score")
         fig_comp.update_yaxes(range=[0, 7], dtick=1)
         st.plotly_chart(fig_comp, use_container_width=True)
 
     st.markdown("**Ranking (Avg Score across Q1–Q4)**")
-    ranking = (
-        filtered[["Participant", "Avg Score", "Gender", "Age"]]
-        .sort_values("Avg Score", ascending=False)
-        .reset_index(drop=True)
-    )
-    ranking["Rank"] = ranking.index + 1
-    st.dataframe(ranking[["Rank", "Participant", "Avg Score", "Gender", "Age"]], use_container_width=True)
+    ranking = get_ranking(*filter_key)
+    # The toggle is only drawn when there is something to truncate.
+    if ranking.num_rows > N_RANKING_PREVIEW and not st.toggle("Show full ranking", key="ranking_show_all"):
+        st.caption(f"Showing the top {N_RANKING_PREVIEW} of {ranking.num_rows} participants.")
+        ranking = ranking.slice(0, N_RANKING_PREVIEW)
+    st.dataframe(ranking, use_container_width=True)
+
+@st.fragment
+def question_view(filter_key: tuple) -> None:
+    filtered = compute_view(*filter_key).filtered
 
-with tab2:
     st.subheader("Question View")
 
-    q = st.selectbox("Select a question", options=QUESTION_COLS)
+    q = st.selectbox("Select a question", options=QUESTION_COLS, key="question")
 
     q_df = filtered[["Participant", "Gender", "Age", q]].rename(columns={q: "Score"})
 
+    stats = question_stats(*filter_key)[q]
+
     c1, c2, c3 = st.columns(3)
-    c1.metric("Mean", f"{q_df['Score'].mean():.2f}")
-    c2.metric("Median", f"{q_df['Score'].median():.2f}")
-    c3.metric("Std Dev", f"{q_df['Score'].std():.2f}" if len(q_df) > 1 else "—")
+    c1.metric("Mean", f"{stats['mean']:.2f}")
+    c2.metric("Median", f"{stats['median']:.2f}")
+    c3.metric("Std Dev", f"{stats['std']:.2f}" if len(q_df) > 1 else "—")
 
     left, right = st.columns(2)
 
     with left:
         st.markdown("**Distribution (histogram)**")
-        fig_hist = px.histogram(
-            q_df,
-            x="Score",
-            nbins=7,
-            template="plotly_dark",
-            title="",
+        # Scores are small integers, so bin them here and send 8 bars instead of every row.
+        counts = np.bincount(q_df["Score"].dropna().to_numpy(dtype=np.int64), minlength=8)
+        fig_hist = go.Figure(go.Bar(x=np.arange(len(counts)), y=counts))
+        fig_hist.update_layout(
+            bargap=0, margin=dict(l=20, r=20, t=20, b=20), xaxis_title="Score", yaxis_title="Count"
         )
-        fig_hist.update_layout(margin=dict(l=20, r=20, t=20, b=20), xaxis_title="Score", yaxis_title="Count")
         fig_hist.update_xaxes(dtick=1)
         fig_hist.update_yaxes(dtick=1)
         st.plotly_chart(fig_hist, use_container_width=True)
@@ -274,10 +431,9 @@ with tab2:
             q_df,
             x="Gender",
             y="Score",
-            points="all",
-            template="plotly_dark",
+            points=box_points(len(q_df)),
             color="Gender",
-            color_discrete_map=gender_color,
+            color_discrete_map=GENDER_COLOR,
             title="",
         )
         fig_q_gender.update_layout(margin=dict(l=20, r=20, t=20, b=20), xaxis_title="Gender", yaxis_title="Score", showlegend=False)
@@ -285,8 +441,9 @@ with tab2:
         st.plotly_chart(fig_q_gender, use_container_width=True)
 
     st.markdown("**Top / Bottom Participants**")
-    top = q_df.sort_values("Score", ascending=False).head(5)
-    bottom = q_df.sort_values("Score", ascending=True).head(5)
+    scores = q_df["Score"].to_numpy()
+    top = q_df.iloc[top_k_positions(scores, 5)]
+    bottom = q_df.iloc[top_k_positions(-scores, 5)]
 
     t1, t2 = st.columns(2)
     with t1:
@@ -297,39 +454,57 @@ with tab2:
         st.dataframe(bottom, hide_index=True, use_container_width=True)
 
     st.markdown("**Average by Age Group**")
-    age_means = q_df.groupby("Age")["Score"].mean().reindex(age_order).reset_index()
-    age_means.columns = ["Age", "Mean Score"]
-
-    fig_age_mean = px.bar(
-        age_means,
-        x="Age",
-        y="Mean Score",
-        template="plotly_dark",
-        category_orders={"Age": age_order},
-        title="",
-        text="Mean Score",
-    )
-    fig_age_mean.update_traces(texttemplate="%{text:.2f}", textposition="outside", cliponaxis=False)
+    age_means = age_question_means(*filter_key)[q]
+
+    fig_age_mean = go.Figure(go.Bar(
+        x=age_means.index,
+        y=age_means.to_numpy(),
+        text=age_means.to_numpy(),
+        texttemplate="%{text:.2f}",
+        textposition="outside",
+        cliponaxis=False,
+    ))
     fig_age_mean.update_layout(margin=dict(l=20, r=20, t=20, b=20), xaxis_title="Age Group", yaxis_title="Mean Score", xaxis_tickangle=-25)
     fig_age_mean.update_yaxes(range=[0, 7], dtick=1)
     st.plotly_chart(fig_age_mean, use_container_width=True)
 
+tab1, tab2 = st.tabs(["Participant View", "Question View"])
+
+with tab1:
+    participant_view(filter_key)
+
+with tab2:
+    question_view(filter_key)
+
 st.divider()
 
 # -------------------------
 # Data viewer + download
 # -------------------------
-st.subheader("Data")
-
-view_option = st.selectbox("Choose what to view", ["Filtered data (current view)", "Full data (all rows)"])
-data_to_show = filtered if view_option.startswith("Filtered") else df
-
-with st.expander("View dataset"):
-    st.dataframe(data_to_show, use_container_width=True)
+@st.fragment
+def data_viewer(filter_key: tuple) -> None:
+    st.subheader("Data")
+
+    view_option = st.selectbox(
+        "Choose what to view",
+        ["Filtered data (current view)", "Full data (all rows)"],
+        key="data_view",
+    )
+    data_key = filter_key if view_option.startswith("Filtered") else None
+
+    with st.expander("View dataset"):
+        table = data_table(data_key)
+        if table.num_rows > N_PREVIEW and not st.toggle("Show all rows", key="data_show_all"):
+            st.caption(f"Showing the first {N_PREVIEW} of {table.num_rows} rows.")
+            table = table.slice(0, N_PREVIEW)
+        st.dataframe(table, use_container_width=True)
+
+    st.download_button(
+        "Download CSV",
+        data=partial(to_csv_bytes, data_key),
+        file_name="survey_data.csv",
+        mime="text/csv",
+        on_click="ignore",
+    )
 
-st.download_button(
-    "Download CSV",
-    data=data_to_show.to_csv(index=False).encode("utf-8"),
-    file_name="survey_data.csv",
-    mime="text/csv"
-)
+data_viewer(filter_key)